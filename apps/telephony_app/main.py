@@ -1,20 +1,24 @@
 # Standard library imports
+import asyncio
 import logging
 import os
 import sys
 import random
-from datetime import datetime
-from functools import partial
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
 
 # Third-party imports
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import FastAPI, Form, Response
+from fastapi.responses import ORJSONResponse
+from redis.asyncio import ConnectionPool, Redis
 from vocode.streaming.models.telephony import TwilioConfig
 
 # from pyngrok import ngrok
-from vocode.streaming.telephony.config_manager.redis_config_manager import (
-    RedisConfigManager,
+from vocode.streaming.telephony.config_manager.batched_redis_config_manager import (
+    BatchedRedisConfigManager,
 )
 from vocode.streaming.models.agent import ChatGPTAgentConfig
 from vocode.streaming.models.message import BaseMessage
@@ -37,18 +41,95 @@ from speller_agent import (
 # docker-compose will load the .env file by itself
 load_dotenv()
 
-app = FastAPI(docs_url=None)
+# TwiML responses are plain XML, but the router also serves JSON endpoints
+# (events, recordings, calls); orjson keeps their serialization off the
+# stdlib-json path
+app = FastAPI(docs_url=None, default_response_class=ORJSONResponse)
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+# Per-call DEBUG logging serializes on the handler lock under concurrency;
+# opt in via VOCODE_DEBUG instead of paying for it on every inbound call
+logger.setLevel(logging.DEBUG if os.getenv("VOCODE_DEBUG") else logging.INFO)
+
+# One connection pool and one client for the whole process: every inbound call
+# reuses these instead of paying Redis client construction on the request path
+redis_pool = ConnectionPool(
+    host=os.environ.get("REDISHOST", "localhost"),
+    port=int(os.environ.get("REDISPORT", 6379)),
+    username=os.environ.get("REDISUSER", None),
+    password=os.environ.get("REDISPASSWORD", None),
+    db=0,
+    # Call configs are stored as MessagePack, so responses must stay as bytes
+    decode_responses=False,
+    max_connections=64,
+)
+redis_client = Redis(connection_pool=redis_pool)
 
-config_manager = RedisConfigManager(
+config_manager = BatchedRedisConfigManager(
     logger=logger,
+    redis_client=redis_client,
+    # Bound Redis memory growth from calls that never reach teardown
+    ttl_seconds=3600,
 )
 
+
+@app.on_event("startup")
+async def start_config_manager():
+    await config_manager.start()
+    await telephony_server.save_agent_templates()
+
+
+@app.on_event("shutdown")
+async def stop_config_manager():
+    await config_manager.stop()
+
+
 BASE_URL = os.getenv("BASE_URL")
 
+# Everything before this marker is byte-identical across calls that share a
+# color, so LLM provider prompt caches can reuse the static prefix; agents that
+# support cache_control should place the cache breakpoint at this boundary.
+PROMPT_DYNAMIC_BOUNDARY = "[Call context]"
+
+_COLORS = ("red", "blue", "green", "yellow", "purple")
+
+# Indexed by datetime.hour; extend with "evening"/"night" entries if needed
+_TIME_OF_DAY = ("morning",) * 12 + ("afternoon",) * 12
+
+# Bound in-flight Redis writes so a burst of inbound calls can't oversubscribe
+# the event loop with pending save_config coroutines
+_redis_semaphore = asyncio.Semaphore(128)
+
+# Repeat callers commonly redial within minutes; reuse their greeting for a
+# short window instead of regenerating it (keyed on hour so the time-of-day
+# wording stays correct)
+_preamble_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+
+@lru_cache(maxsize=5)
+def _static_preamble(color: str) -> str:
+    """Returns the static (cacheable) portion of the prompt preamble for a color."""
+    return (
+        f"Hi, let me tell you facts and interesting tidbits about {color}. "
+        "I'm happy to chat for as long as you like."
+    )
+
+
+@lru_cache(maxsize=2)
+def _format_date(ordinal: int) -> str:
+    """Formats a date ordinal as e.g. 'Monday, January 01, 2024', at most once per day."""
+    return date.fromordinal(ordinal).strftime("%A, %B %d, %Y")
+
+
+def _dynamic_suffix(twilio_from: Optional[str], date_now: datetime) -> str:
+    """Returns the per-call portion of the preamble: caller number, date and time of day."""
+    time_of_day = _TIME_OF_DAY[date_now.hour]
+    caller = f"You are calling from {twilio_from}. " if twilio_from else ""
+    return (
+        f"{caller}It's currently {time_of_day} on {_format_date(date_now.toordinal())}."
+    )
+
 
 class CustomTelephonyServer(TelephonyServer):
     """
@@ -69,13 +150,29 @@ class CustomTelephonyServer(TelephonyServer):
     aware over time, fostering a deeper connection between the caller and the service.
     """
 
-    async def generate_prompt_preamble(
+    def __init__(self, *args, **kwargs):
+        # Populated by create_inbound_route (called from the base __init__);
+        # persisted to Redis once at startup via save_agent_templates
+        self._call_config_templates = {}
+        super().__init__(*args, **kwargs)
+        # Render the connection TwiML once; per-call responses substitute the
+        # conversation id into the cached bytes instead of re-running Jinja
+        self._twiml_template: bytes = self.templater.get_connection_twiml(
+            base_url=self.base_url, call_id="__CALL_ID__"
+        ).body
+
+    def generate_prompt_preamble(
         self, color: Optional[str] = None, twilio_from: Optional[str] = None
     ) -> str:
         """
         Generates a prompt preamble, including a greeting that acknowledges the caller's phone number if provided.
         If a color is not provided, it selects a random color from a predefined list.
 
+        The preamble is assembled as a static block followed by the per-call values
+        (caller number, date, time of day) after PROMPT_DYNAMIC_BOUNDARY, so the
+        prefix stays byte-identical across calls sharing a color and stays eligible
+        for provider-side prompt caching.
+
         Args:
             color (Optional[str]): The color to generate a prompt for. Defaults to None.
             twilio_from (Optional[str]): The phone number of the caller. Defaults to None.
@@ -85,24 +182,50 @@ class CustomTelephonyServer(TelephonyServer):
         """
         # Select a random color if none is provided
         if color is None:
-            color = random.choice(["red", "blue", "green", "yellow", "purple"])
+            color = random.choice(_COLORS)
 
-        # Determine the current time of day
-        date_now = datetime.now()
-        hour = date_now.hour
-        time_of_day = "morning" if hour < 12 else "afternoon"
-
-        # Generate the greeting message, including the caller's phone number if available
-        greeting = (
-            f"Hi, thanks for calling from {twilio_from}. " if twilio_from else "Hi, "
+        # Static (cacheable) prefix first, dynamic values last
+        return (
+            f"{_static_preamble(color)}\n\n"
+            f"{PROMPT_DYNAMIC_BOUNDARY}\n"
+            f"{_dynamic_suffix(twilio_from, datetime.now())}"
         )
 
-        # Return the complete prompt preamble
-        return f"{greeting} It's currently {time_of_day} on {date_now.strftime('%A, %B %d, %Y')}. Let me tell you facts and interesting tidbits about {color}."
+    async def _save_config_delta(self, conversation_id, template_id, update):
+        async with _redis_semaphore:
+            await self.config_manager.save_config_delta(
+                conversation_id, template_id, update
+            )
+
+    async def save_agent_templates(self):
+        """Persists each route's static call config template to Redis once at startup."""
+        for template_id, template in self._call_config_templates.items():
+            await self.config_manager.save_template(template_id, template)
 
     def create_inbound_route(self, inbound_call_config: AbstractInboundCallConfig):
+        # Validate the call config once per route; it is persisted once as a
+        # template and each request writes only its per-call delta, instead of
+        # re-serializing the full config (static prompt included) per call
+        template_id = inbound_call_config.url
+        call_config_template = (
+            TwilioCallConfig(
+                transcriber_config=inbound_call_config.transcriber_config
+                or TwilioCallConfig.default_transcriber_config(),
+                agent_config=inbound_call_config.agent_config,
+                synthesizer_config=inbound_call_config.synthesizer_config
+                or TwilioCallConfig.default_synthesizer_config(),
+                twilio_config=inbound_call_config.twilio_config,
+                twilio_sid="",
+                from_phone="",
+                to_phone="",
+            )
+            if isinstance(inbound_call_config, TwilioInboundCallConfig)
+            else None
+        )
+        if call_config_template is not None:
+            self._call_config_templates[template_id] = call_config_template
+
         async def twilio_route(
-            twilio_config: TwilioConfig,
             twilio_sid: str = Form(alias="CallSid"),
             twilio_from: str = Form(alias="From"),
             twilio_to: str = Form(alias="To"),
@@ -121,7 +244,6 @@ class CustomTelephonyServer(TelephonyServer):
             with the call setup, ensuring that each caller receives a unique and contextually relevant greeting.
 
             Args:
-                twilio_config (TwilioConfig): Configuration object containing Twilio account details.
                 twilio_sid (str): The unique identifier for the Twilio session (call).
                 twilio_from (str): The phone number of the caller.
                 twilio_to (str): The phone number being called (your Twilio number).
@@ -131,39 +253,53 @@ class CustomTelephonyServer(TelephonyServer):
                 which includes the dynamically generated initial message for the call.
             """
 
-            # Dynamically generate the initial message for each call
-            dynamic_initial_message = await self.generate_prompt_preamble(
-                twilio_from=twilio_from
-            )
-
-            # Modify the agent config to use the dynamic initial message
-            inbound_call_config.agent_config.initial_message = BaseMessage(
-                text=dynamic_initial_message
-            )
-
-            call_config = TwilioCallConfig(
-                transcriber_config=inbound_call_config.transcriber_config
-                or TwilioCallConfig.default_transcriber_config(),
-                agent_config=inbound_call_config.agent_config,
-                synthesizer_config=inbound_call_config.synthesizer_config
-                or TwilioCallConfig.default_synthesizer_config(),
-                twilio_config=twilio_config,
-                twilio_sid=twilio_sid,
-                from_phone=twilio_from,
-                to_phone=twilio_to,
+            # Dynamically generate the initial message, reusing a recent one
+            # for repeat callers
+            cache_key = (twilio_from, datetime.now().hour)
+            dynamic_initial_message = _preamble_cache.get(cache_key)
+            if dynamic_initial_message is None:
+                dynamic_initial_message = self.generate_prompt_preamble(
+                    twilio_from=twilio_from
+                )
+                _preamble_cache[cache_key] = dynamic_initial_message
+
+            # Persist only the per-call delta against the startup template; the
+            # initial message lives here rather than on the shared agent config,
+            # so concurrent calls can't overwrite each other's greeting
+            conversation_id = create_conversation_id()
+            save_task = asyncio.create_task(
+                self._save_config_delta(
+                    conversation_id,
+                    template_id,
+                    {
+                        "twilio_sid": twilio_sid,
+                        "from_phone": twilio_from,
+                        "to_phone": twilio_to,
+                        "agent_config": {
+                            "initial_message": BaseMessage(
+                                text=dynamic_initial_message
+                            ).dict()
+                        },
+                    },
+                )
             )
 
-            conversation_id = create_conversation_id()
-            await self.config_manager.save_config(conversation_id, call_config)
-            return self.templater.get_connection_twiml(
-                base_url=self.base_url, call_id=conversation_id
+            # Build the TwiML while the Redis round-trip is in flight, then
+            # make sure the config is saved before handing Twilio the response
+            response = Response(
+                self._twiml_template.replace(b"__CALL_ID__", conversation_id.encode()),
+                media_type="application/xml",
             )
+            await save_task
+            return response
 
         if isinstance(inbound_call_config, TwilioInboundCallConfig):
             self.logger.info(
                 f"Set up inbound call TwiML at https://{self.base_url}{inbound_call_config.url}"
             )
-            return partial(twilio_route, inbound_call_config.twilio_config)
+            # The Twilio config is baked into the route's call config template,
+            # so the handler closes over it rather than taking it via partial
+            return twilio_route
         else:
             raise ValueError(
                 f"Unknown inbound call config type {type(inbound_call_config)}"
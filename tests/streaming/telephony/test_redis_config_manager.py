@@ -0,0 +1,103 @@
+import pytest
+
+from vocode.streaming.models.agent import ChatGPTAgentConfig
+from vocode.streaming.models.message import BaseMessage
+from vocode.streaming.models.telephony import (
+    BaseCallConfig,
+    TwilioCallConfig,
+    TwilioConfig,
+)
+from vocode.streaming.telephony.config_manager import redis_config_manager
+from vocode.streaming.telephony.config_manager.redis_config_manager import (
+    RedisConfigManager,
+    deep_merge,
+)
+
+
+def create_call_config() -> TwilioCallConfig:
+    return TwilioCallConfig(
+        transcriber_config=TwilioCallConfig.default_transcriber_config(),
+        agent_config=ChatGPTAgentConfig(
+            initial_message=BaseMessage(text="hello"),
+            prompt_preamble="static prompt",
+            generate_responses=True,
+        ),
+        synthesizer_config=TwilioCallConfig.default_synthesizer_config(),
+        twilio_config=TwilioConfig(account_sid="sid", auth_token="token"),
+        twilio_sid="CA123",
+        from_phone="+15551234567",
+        to_phone="+15557654321",
+    )
+
+
+def test_serialize_round_trip_msgpack():
+    pytest.importorskip("msgspec")
+    manager = RedisConfigManager()
+    config = create_call_config()
+    raw = manager._serialize(config)
+    assert isinstance(raw, bytes)
+    # msgpack output must not be mistaken for a legacy JSON key
+    assert raw[:1] not in (b"{", b"[")
+    assert BaseCallConfig.parse_obj(manager._decode(raw)) == config
+
+
+def test_serialize_round_trip_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    monkeypatch.setattr(redis_config_manager, "_msgpack_encoder", None)
+    monkeypatch.setattr(redis_config_manager, "_msgpack_decoder", None)
+    manager = RedisConfigManager()
+    config = create_call_config()
+    raw = manager._serialize(config)
+    assert raw[:1] == b"{"
+    assert BaseCallConfig.parse_obj(manager._decode(raw)) == config
+
+
+def test_decode_legacy_json_keys():
+    manager = RedisConfigManager()
+    config = create_call_config()
+    # Keys written by the old config.json() path, as str (decode_responses
+    # clients) and as bytes
+    assert BaseCallConfig.parse_obj(manager._decode(config.json())) == config
+    assert BaseCallConfig.parse_obj(manager._decode(config.json().encode())) == config
+
+
+def test_decode_msgpack_without_msgspec_raises(monkeypatch):
+    pytest.importorskip("msgspec")
+    manager = RedisConfigManager()
+    raw = manager._serialize(create_call_config())
+    monkeypatch.setattr(redis_config_manager, "_msgpack_decoder", None)
+    with pytest.raises(ValueError, match="msgspec is not installed"):
+        manager._decode(raw)
+
+
+def test_deep_merge_overrides_top_level_fields():
+    base = {"from_phone": "", "to_phone": "", "twilio_sid": ""}
+    update = {"from_phone": "+15551234567", "twilio_sid": "CA123"}
+    assert deep_merge(base, update) == {
+        "from_phone": "+15551234567",
+        "to_phone": "",
+        "twilio_sid": "CA123",
+    }
+
+
+def test_deep_merge_merges_nested_dicts():
+    base = {
+        "agent_config": {
+            "prompt_preamble": "static prompt",
+            "initial_message": {"type": "message_base", "text": "placeholder"},
+        }
+    }
+    update = {
+        "agent_config": {"initial_message": {"type": "message_base", "text": "dynamic"}}
+    }
+    merged = deep_merge(base, update)
+    assert merged["agent_config"]["prompt_preamble"] == "static prompt"
+    assert merged["agent_config"]["initial_message"]["text"] == "dynamic"
+
+
+def test_deep_merge_does_not_mutate_inputs():
+    base = {"agent_config": {"prompt_preamble": "static prompt"}}
+    update = {"agent_config": {"initial_message": {"text": "dynamic"}}}
+    deep_merge(base, update)
+    assert base == {"agent_config": {"prompt_preamble": "static prompt"}}
+    assert update == {"agent_config": {"initial_message": {"text": "dynamic"}}}
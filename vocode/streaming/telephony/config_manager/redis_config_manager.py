@@ -1,37 +1,149 @@
+import json
 import logging
 import os
-from typing import Optional
+from typing import Any, Dict, Optional, Union
 from redis.asyncio import Redis
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import msgspec.msgpack
+
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+    _msgpack_decoder = msgspec.msgpack.Decoder()
+except ImportError:
+    _msgpack_encoder = None  # type: ignore
+    _msgpack_decoder = None  # type: ignore
+
 from vocode.streaming.models.telephony import BaseCallConfig
 from vocode.streaming.telephony.config_manager.base_config_manager import (
     BaseConfigManager,
 )
 
+TEMPLATE_KEY_PREFIX = "agent_template:"
+
+
+def deep_merge(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of base with update applied; nested dicts merge recursively."""
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
 
 class RedisConfigManager(BaseConfigManager):
-    def __init__(self, logger: Optional[logging.Logger] = None):
-        self.redis: Redis = Redis(
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        redis_client: Optional[Redis] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.redis: Redis = redis_client or Redis(
             host=os.environ.get("REDISHOST", "localhost"),
             port=int(os.environ.get("REDISPORT", 6379)),
             username=os.environ.get("REDISUSER", None),
             password=os.environ.get("REDISPASSWORD", None),
             db=0,
-            decode_responses=True,
+            # Values may be MessagePack (binary), so responses stay as bytes
+            decode_responses=False,
         )
         self.logger = logger or logging.getLogger(__name__)
+        # Expiration for per-call keys (templates are exempt); calls that never
+        # reach teardown would otherwise leak their config in Redis forever
+        self.ttl_seconds = ttl_seconds
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    def _encode(self, payload: Dict[str, Any]) -> Union[bytes, str]:
+        # Prefer MessagePack (smaller and faster to encode/decode than JSON),
+        # then orjson, then the stdlib
+        if _msgpack_encoder is not None:
+            return _msgpack_encoder.encode(payload)
+        if orjson is not None:
+            return orjson.dumps(payload)
+        return json.dumps(payload)
+
+    def _decode(self, raw: Union[bytes, str]) -> Dict[str, Any]:
+        # Keys written before the MessagePack switch (or by workers without
+        # msgspec) hold JSON; a msgpack map never starts with '{' or '['
+        if isinstance(raw, str):
+            return json.loads(raw)
+        if raw[:1] in (b"{", b"["):
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw)
+        if _msgpack_decoder is None:
+            raise ValueError(
+                "Found a MessagePack-encoded config but msgspec is not installed; "
+                "install msgspec (or the vocode[telephony] extra) to read it"
+            )
+        return _msgpack_decoder.decode(raw)
+
+    def _serialize(self, config: BaseCallConfig) -> Union[bytes, str]:
+        if _msgpack_encoder is not None or orjson is not None:
+            return self._encode(config.dict())
+        # pydantic's own encoder handles any field types the stdlib can't
+        return config.json()
+
+    async def _set(self, key: str, value: Union[bytes, str]):
+        # SET with EX expires the key in the same round-trip (vs SET + EXPIRE)
+        await self.redis.set(key, value, ex=self.ttl_seconds)
 
     async def save_config(self, conversation_id: str, config: BaseCallConfig):
-        self.logger.debug(f"Saving config for {conversation_id}")
-        await self.redis.set(conversation_id, config.json())
+        self.logger.debug("Saving config for %s", conversation_id)
+        await self._set(conversation_id, self._serialize(config))
+
+    async def save_template(self, template_id: str, config: BaseCallConfig):
+        """Persists the static portion of a call config once, for reuse by deltas."""
+        self.logger.debug("Saving config template %s", template_id)
+        self._templates[template_id] = config.dict()
+        await self.redis.set(TEMPLATE_KEY_PREFIX + template_id, self._serialize(config))
+
+    async def save_config_delta(
+        self, conversation_id: str, template_id: str, update: Dict[str, Any]
+    ):
+        """Persists only the per-call fields, referencing a saved template.
+
+        get_config recursively merges the update into the template, so nested
+        fields (e.g. agent_config.initial_message) can be overridden without
+        re-serializing the rest of the config on every call.
+        """
+        self.logger.debug("Saving config delta for %s", conversation_id)
+        payload = {"template_ref": template_id, "update": update}
+        await self._set(conversation_id, self._encode(payload))
+
+    async def _get_template(self, template_id: str) -> Optional[Dict[str, Any]]:
+        template = self._templates.get(template_id)
+        if template is None:
+            raw_template = await self.redis.get(TEMPLATE_KEY_PREFIX + template_id)
+            if raw_template is None:
+                return None
+            template = self._decode(raw_template)
+            self._templates[template_id] = template
+        return template
 
     async def get_config(self, conversation_id) -> Optional[BaseCallConfig]:
-        self.logger.debug(f"Getting config for {conversation_id}")
+        self.logger.debug("Getting config for %s", conversation_id)
         raw_config = await self.redis.get(conversation_id)
-        if raw_config:
-            return BaseCallConfig.parse_raw(raw_config)
-        return None
+        if not raw_config:
+            return None
+        config_dict = self._decode(raw_config)
+        if "template_ref" in config_dict:
+            template = await self._get_template(config_dict["template_ref"])
+            if template is None:
+                self.logger.error(
+                    f"Missing config template {config_dict['template_ref']} "
+                    f"for {conversation_id}"
+                )
+                return None
+            config_dict = deep_merge(template, config_dict["update"])
+        return BaseCallConfig.parse_obj(config_dict)
 
     async def delete_config(self, conversation_id):
-        self.logger.debug(f"Deleting config for {conversation_id}")
+        self.logger.debug("Deleting config for %s", conversation_id)
         await self.redis.delete(conversation_id)
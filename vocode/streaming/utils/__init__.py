@@ -63,7 +63,9 @@ def get_chunk_size_per_second(audio_encoding: AudioEncoding, sampling_rate: int)
 
 
 def create_conversation_id() -> str:
-    return secrets.token_urlsafe(16)
+    # token_hex is a single C call (urandom + bytes.hex); token_urlsafe adds
+    # base64 encoding, padding strip and decode on top of the same entropy
+    return secrets.token_hex(16)
 
 
 def remove_non_letters_digits(text):